@@ -1,5 +1,6 @@
 """CAN Calibration Protocol."""
 
-from .master import Master
-from .sessions import DAQSession
+from .error import CCPError
+from .master import Master, CCP_VERSION, MemoryTransferAddressNumber
+from .sessions import DAQSession, SessionStatus
 from .messages import Element
@@ -3,31 +3,200 @@
 """A can.Listener which sorts incoming CCP messages by type."""
 
 import can
+import collections
 import queue
 import logging
+import threading
+import time
+from typing import List
 
 from pyccp import messages
 
 
 logger = logging.getLogger(__name__)
 
+_format_hex = "{:02x}".format
+
+
+def _hexlist(data: bytearray) -> str:
+    """Format data as space separated, two digit hex bytes."""
+    try:
+        return data.hex(" ")
+    except TypeError:
+        # Python < 3.8, where hex() takes no separator.
+        return " ".join(map(_format_hex, data))
+
+
+def _build_return_code_names() -> List[str]:
+    names = ["0x{:02X}".format(i) for i in range(0x100)]
+
+    for return_code in messages.ReturnCodes:
+        names[return_code] = return_code.name
+
+    return names
+
+
+# Return code names by value, looked up once per logged CRM/EVM. Unknown
+# codes are logged as hex rather than raising from the listener.
+_RETURN_CODE_NAMES = _build_return_code_names()
+
+
+class _MessageQueue:
+    """A FIFO for one producer and one consumer.
+
+    queue.Queue takes its lock and notifies a condition on every put and
+    get. deque.append and deque.popleft are atomic, so here only a consumer
+    which finds the queue empty has to wait on an Event.
+    """
+
+    def __init__(self):
+        self._items = collections.deque()
+        self._ready = threading.Event()
+
+    def put(self, item):
+        """Append item to the queue."""
+        self._items.append(item)
+        self._ready.set()
+
+    def get(self, timeout: float = None):
+        """Remove and return the oldest item in the queue.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Time in seconds to wait for an item. The default is None, which
+            waits indefinitely.
+
+        Returns
+        -------
+        The oldest item in the queue.
+
+        Raises
+        ------
+        queue.Empty if no item can be returned within timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+
+            # Clear before checking again, so that an item put after the
+            # check sets the event and ends the wait below.
+            self._ready.clear()
+
+            if self._items:
+                continue
+
+            if deadline is None:
+                self._ready.wait()
+                continue
+
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0 or not self._ready.wait(remaining):
+                raise queue.Empty
+
+    def get_many(self, max_count: int = None, timeout: float = None) -> list:
+        """Remove and return up to max_count items, oldest first.
+
+        Waits like get for the first item, but not for the rest.
+
+        Parameters
+        ----------
+        max_count : int, optional
+            Maximum number of items to return. The default is None, which
+            returns every queued item.
+        timeout : float, optional
+            Time in seconds to wait for the first item. The default is None,
+            which waits indefinitely.
+
+        Returns
+        -------
+        list
+            At least one item, and at most max_count.
+
+        Raises
+        ------
+        ValueError if max_count is less than 1.
+        queue.Empty if no item can be returned within timeout seconds.
+        """
+        if max_count is not None and max_count < 1:
+            raise ValueError("max_count must be at least 1, not {}".format(max_count))
+
+        items = [self.get(timeout)]
+        popleft = self._items.popleft
+
+        while max_count is None or len(items) < max_count:
+            try:
+                items.append(popleft())
+            except IndexError:
+                break
+
+        return items
+
 
 class MessageSorter(can.Listener):
     """A can.Listener which sorts incoming CCP messages by type."""
 
+    __slots__ = (
+        "dto_id",
+        "cro_id",
+        "track_cro",
+        "_crm_queue",
+        "_evm_queue",
+        "_daq_queue",
+        "_cro_queue",
+        "_put_crm",
+        "_put_evm",
+        "_put_daq",
+        "_put_cro",
+        "_dto_handlers",
+    )
+
     def __init__(
-        self, dto_id: int, cro_id: int,
+        self, dto_id: int, cro_id: int, track_cro: bool = False,
     ):
-        self.dto_id = dto_id
-        self.cro_id = cro_id
+        """Create a MessageSorter.
 
-        self._crm_queue = queue.Queue()
-        self._evm_queue = queue.Queue()
-        self._daq_queue = queue.Queue()
-        self._cro_queue = queue.Queue()
+        Parameters
+        ----------
+        dto_id : int
+            Arbitration ID of DTOs.
+        cro_id : int
+            Arbitration ID of CROs.
+        track_cro : bool, optional
+            Queue received CROs, which only arrive if the bus echoes the
+            master's own frames. Nothing reads them during normal operation,
+            so by default they are dropped. The default is False.
 
-    def _hexlist(self, data: bytearray) -> str:
-        return " ".join([format(b, "x") for b in data])
+        Returns
+        -------
+        None.
+        """
+        self.dto_id = dto_id
+        self.cro_id = cro_id
+        self.track_cro = track_cro
+
+        self._crm_queue = _MessageQueue()
+        self._evm_queue = _MessageQueue()
+        self._daq_queue = _MessageQueue()
+        self._cro_queue = _MessageQueue()
+        # Bound once here rather than looked up for every received frame.
+        # Frames are queued as received and only converted to CCP messages
+        # when taken from the queue, so frames which are never read cost no
+        # copy.
+        self._put_crm = self._crm_queue.put
+        self._put_evm = self._evm_queue.put
+        self._put_daq = self._daq_queue.put
+        self._put_cro = self._cro_queue.put
+
+        # DTO subtype is determined by the PID byte alone, so look the handler
+        # up by PID instead of testing each subtype in turn: 0-0xFD is DAQ,
+        # 0xFE is EVM and 0xFF is CRM.
+        self._dto_handlers = (self._on_daq,) * 0xFE + (self._on_evm, self._on_crm)
 
     def on_message_received(self, msg: can.Message):
         """Sort an incoming message.
@@ -40,37 +209,49 @@ class MessageSorter(can.Listener):
         -------
         None.
         """
-        if messages.is_crm(msg=msg, dto_id=self.dto_id):
-            msg = messages.CommandReturnMessage.from_can_message(msg)
-            self._crm_queue.put(msg)
+        arbitration_id = msg.arbitration_id
+
+        if arbitration_id == self.dto_id:
+            self._dto_handlers[msg.data[0]](msg)
+        elif arbitration_id == self.cro_id and self.track_cro:
+            self._on_cro(msg)
+
+    def _on_crm(self, msg: can.Message):
+        self._put_crm(msg)
+
+        # Resolving the return code name and formatting the data is wasted
+        # work for every CRM unless debug logging is actually on.
+        if logger.isEnabledFor(logging.DEBUG):
             ctr = msg.data[messages.MessageByte.CRM_CTR]
-            return_code = messages.ReturnCodes(
-                msg.data[messages.MessageByte.DTO_ERR]
-            ).name
-            data = self._hexlist(msg.data[3:])
-            logger.debug("Received CRM {}:  %s  %s".format(ctr), return_code, data)
-
-        elif messages.is_evm(msg=msg, dto_id=self.dto_id):
-            msg = messages.EventMessage.from_can_message(msg)
-            self._evm_queue.put(msg)
-            return_code = messages.ReturnCodes(
-                msg.data[messages.MessageByte.DTO_ERR]
-            ).name
+            return_code = _RETURN_CODE_NAMES[msg.data[messages.MessageByte.DTO_ERR]]
+            data = _hexlist(memoryview(msg.data)[3:])
+            logger.debug("Received CRM %s:  %s  %s", ctr, return_code, data)
+
+    def _on_evm(self, msg: can.Message):
+        self._put_evm(msg)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            return_code = _RETURN_CODE_NAMES[msg.data[messages.MessageByte.DTO_ERR]]
             logger.debug("Received EVM:  %s", return_code)
 
-        elif messages.is_daq(msg=msg, dto_id=self.dto_id):
-            msg = messages.DataAcquisitionMessage().from_can_message(msg)
-            self._daq_queue.put(msg)
+    def _on_daq(self, msg: can.Message):
+        self._put_daq(msg)
+
+        if logger.isEnabledFor(logging.DEBUG):
             odt_number = msg.data[messages.MessageByte.DTO_PID]
             logger.debug("Received DAQ#%s", odt_number)
 
-            for k, v in msg.decode().items():
-                logger.info("{},{},{}".format(msg.timestamp, k, v))
+        # Decoding is the expensive part of handling a DAQ, and here it is
+        # only needed for the log.
+        if logger.isEnabledFor(logging.INFO):
+            daq = messages.DataAcquisitionMessage.from_can_message(msg)
+
+            for k, v in daq.decode().items():
+                logger.info("%s,%s,%s", msg.timestamp, k, v)
 
-        elif messages.is_cro(msg=msg, cro_id=self.cro_id):
-            msg = messages.CommandReceiveObject().from_can_message(msg)
-            self._cro_queue.put(msg)
-            # CROs are logged by master
+    def _on_cro(self, msg: can.Message):
+        self._put_cro(msg)
+        # CROs are logged by master
 
     def get_command_return_message(
         self, timeout: float = 0.5
@@ -91,7 +272,38 @@ class MessageSorter(can.Listener):
         ------
         queue.Empty if no message can be returned within timeout seconds.
         """
-        return self._crm_queue.get(timeout=timeout)
+        msg = self._crm_queue.get(timeout=timeout)
+        return messages.CommandReturnMessage.from_can_message(msg)
+
+    def get_command_return_messages(
+        self, max_count: int = None, timeout: float = 0.5
+    ) -> List[messages.CommandReturnMessage]:
+        """Return the CRMs in the queue, oldest first.
+
+        Waits for the first CRM, then takes whatever else is already queued
+        without waiting again.
+
+        Parameters
+        ----------
+        max_count : int, optional
+            Maximum number of CRMs to return. The default is None, which
+            returns every queued CRM.
+        timeout : float, optional
+            Time in seconds to wait for the first CRM before raising Empty.
+            The default is 0.5.
+
+        Returns
+        -------
+        List[CommandReturnMessage]
+            At least one CRM, and at most max_count.
+
+        Raises
+        ------
+        ValueError if max_count is less than 1.
+        queue.Empty if no message can be returned within timeout seconds.
+        """
+        batch = self._crm_queue.get_many(max_count, timeout)
+        return [messages.CommandReturnMessage.from_can_message(m) for m in batch]
 
     def get_event_message(self, timeout=0.5) -> messages.EventMessage:
         """Return the first EVM in the queue.
@@ -110,7 +322,8 @@ class MessageSorter(can.Listener):
         ------
         queue.Empty if no message can be returned within timeout seconds.
         """
-        return self._evm_queue.get(timeout=timeout)
+        msg = self._evm_queue.get(timeout=timeout)
+        return messages.EventMessage.from_can_message(msg)
 
     def get_data_acquisition_message(
         self, timeout: float = 0.5
@@ -131,7 +344,39 @@ class MessageSorter(can.Listener):
         ------
         queue.Empty if no message can be returned within timeout seconds.
         """
-        return self._daq_queue.get(timeout=timeout)
+        msg = self._daq_queue.get(timeout=timeout)
+        return messages.DataAcquisitionMessage.from_can_message(msg)
+
+    def get_data_acquisition_messages(
+        self, max_count: int = None, timeout: float = 0.5
+    ) -> List[messages.DataAcquisitionMessage]:
+        """Return the DAQs in the queue, oldest first.
+
+        Waits for the first DAQ, then takes whatever else is already queued
+        without waiting again. Consumers which handle DAQ data in batches can
+        use this instead of one get_data_acquisition_message call per frame.
+
+        Parameters
+        ----------
+        max_count : int, optional
+            Maximum number of DAQs to return. The default is None, which
+            returns every queued DAQ.
+        timeout : float, optional
+            Time in seconds to wait for the first DAQ before raising Empty.
+            The default is 0.5.
+
+        Returns
+        -------
+        List[DataAcquisitionMessage]
+            At least one DAQ, and at most max_count.
+
+        Raises
+        ------
+        ValueError if max_count is less than 1.
+        queue.Empty if no message can be returned within timeout seconds.
+        """
+        batch = self._daq_queue.get_many(max_count, timeout)
+        return [messages.DataAcquisitionMessage.from_can_message(m) for m in batch]
 
     def get_command_receive_object(
         self, timeout: float = 0.5
@@ -151,5 +396,10 @@ class MessageSorter(can.Listener):
         Raises
         ------
         queue.Empty if no message can be returned within timeout seconds.
+        RuntimeError if track_cro is False.
         """
-        return self._cro_queue.get(timeout=timeout)
+        if not self.track_cro:
+            raise RuntimeError("CRO tracking is disabled")
+
+        msg = self._cro_queue.get(timeout=timeout)
+        return messages.CommandReceiveObject.from_can_message(msg)
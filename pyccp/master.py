@@ -5,9 +5,15 @@ import can
 import enum
 import logging
 from queue import Empty
+from typing import Iterable, List, Tuple
 
 from .error import CCPError
-from .messages import CommandCodes, ReturnCodes, CommandReceiveObject
+from .messages import (
+    CommandCodes,
+    ReturnCodes,
+    CommandReceiveObject,
+    CommandReturnMessage,
+)
 from .listeners import MessageSorter
 
 
@@ -16,6 +22,14 @@ logger = logging.getLogger(__name__)
 
 CCP_VERSION = (2, 1)
 
+# Compared against every CRM's return code; a plain int skips the enum
+# attribute lookup.
+_ACKNOWLEDGE = int(ReturnCodes.ACKNOWLEDGE)
+
+# Number of data bytes a CRM can carry, and so the most a single UPLOAD can
+# return.
+_CRM_DATA_SIZE = 5
+
 
 class MemoryTransferAddressNumber(enum.IntEnum):
     """The MTA numbers refer to a pair of pointers in the slave device.
@@ -39,31 +53,36 @@ class Master:
         self.cro_id = cro_id
         self.dto_id = dto_id
         self._transport = transport
-        # Receive both DTOs and CROs, the latter in case local echo is enabled.
+        # Only DTOs are read. Echoed CROs would be dropped by the sorter anyway,
+        # so let the bus filter them out, in the kernel where it can.
         self._transport.set_filters(
-            [
-                {"can_id": dto_id, "can_mask": 0x1FFFFFFF, "extended": True},
-                {"can_id": cro_id, "can_mask": 0x1FFFFFFF, "extended": True},
-            ]
+            [{"can_id": dto_id, "can_mask": 0x1FFFFFFF, "extended": True}]
         )
         self._queue = MessageSorter(dto_id, cro_id)
         self._notifier = can.Notifier(self._transport, [self._queue])
         self.ctr = 0
+        # CROs sent but not yet answered. The next CRO's counter is ctr plus
+        # this, so that several commands can be in flight at once.
+        self._pending = 0
+        # Repacked in place for every command. Bus.send serializes or copies
+        # the frame before returning, so reusing it is safe.
+        self._cro = CommandReceiveObject(arbitration_id=cro_id)
 
     def _send(self, command_code: CommandCodes, **kwargs):
-        cro = CommandReceiveObject(
-            arbitration_id=self.cro_id,
-            command_code=command_code,
-            ctr=self.ctr,
-            **kwargs
-        )
-        self._transport.send(cro)
-        kwargs_str = "  ".join([k.upper() + ": " + hex(v) for k, v in kwargs.items()])
-        logger.debug(
-            "Sent CRO CTR{}:  %s  %s".format(self.ctr), command_code.name, kwargs_str
-        )
+        ctr = (self.ctr + self._pending) & 0xFF
+        self._cro.pack(command_code, ctr, **kwargs)
+        self._transport.send(self._cro)
+        self._pending += 1
+
+        if logger.isEnabledFor(logging.DEBUG):
+            kwargs_str = "  ".join(
+                [k.upper() + ": " + hex(v) for k, v in kwargs.items()]
+            )
+            logger.debug(
+                "Sent CRO CTR%s:  %s  %s", ctr, command_code.name, kwargs_str
+            )
 
-    def _receive(self) -> bytearray:
+    def _receive(self) -> memoryview:
         """Check that the response is what we expect it to be.
 
         Raises
@@ -75,26 +94,102 @@ class Master:
 
         Returns
         -------
-        bytearray
-            Five data bytes.
+        memoryview
+            Five data bytes, viewed in place in the CRM.
 
         """
+        return self._check_reply(self._get_replies(1)[0])
+
+    def _get_replies(self, max_count: int) -> List[CommandReturnMessage]:
         try:
-            crm = self._queue.get_command_return_message()
+            return self._queue.get_command_return_messages(max_count)
         except Empty:
+            self._pending = 0
             raise CCPError("No reply from slave")
 
+    def _check_reply(self, crm: CommandReturnMessage) -> memoryview:
         if crm.ctr == self.ctr:
-            self.ctr = (self.ctr + 1) % 0x100
+            self.ctr = (self.ctr + 1) & 0xFF
+            self._pending = max(self._pending - 1, 0)
         else:
+            self._pending = 0
             raise CCPError(
                 "Counter mismatch: Internal {}, received {}".format(self.ctr, crm.ctr)
             )
 
-        if crm.return_code == ReturnCodes.ACKNOWLEDGE:
-            return crm.data[3:]
+        return_code = crm.return_code
+
+        if return_code == _ACKNOWLEDGE:
+            return memoryview(crm.data)[3:]
         else:
-            raise CCPError(ReturnCodes(crm.return_code).name)
+            raise CCPError(return_code.name)
+
+    def _send_batch(
+        self, commands: Iterable[Tuple[CommandCodes, dict]], window: int = 1
+    ) -> List[memoryview]:
+        """Send commands, keeping up to window of them awaiting a reply.
+
+        Parameters
+        ----------
+        commands : Iterable[Tuple[CommandCodes, dict]]
+            (command_code, {keyword: value}) for each command, in order.
+        window : int, optional
+            Maximum number of commands awaiting a reply. The default is 1,
+            which is the same as sending each command with _send and _receive.
+
+        Raises
+        ------
+        ValueError
+            If window is less than 1.
+        can.CanError
+            If any command fails, including CCPError from _receive. Replies
+            to commands already sent are discarded before raising, whatever
+            the error.
+
+        Returns
+        -------
+        List[memoryview]
+            The data bytes of each command's reply, in order.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1, not {}".format(window))
+
+        replies = []
+        in_flight = 0
+
+        try:
+            for command_code, kwargs in commands:
+                if in_flight == window:
+                    in_flight -= 1
+                    replies.append(self._receive())
+
+                self._send(command_code, **kwargs)
+                in_flight += 1
+
+            # Collect whatever replies have already arrived in one go.
+            while in_flight:
+                crms = self._get_replies(in_flight)
+                in_flight -= len(crms)
+                replies.extend(self._check_reply(crm) for crm in crms)
+        except BaseException:
+            # Also on errors such as a later command failing to pack, or
+            # KeyboardInterrupt, lest stale replies be matched to the
+            # counters of later commands.
+            self._discard_replies(in_flight)
+            raise
+
+        return replies
+
+    def _discard_replies(self, count: int):
+        # Keep stale replies to a failed batch from being taken as replies to
+        # later commands.
+        for _ in range(count):
+            try:
+                self._queue.get_command_return_message()
+            except Empty:
+                break
+
+        self._pending = 0
 
     def stop(self):
         """Disconnect from CAN bus.
@@ -210,7 +305,7 @@ class Master:
         """
         self._send(CommandCodes.DNLOAD, size=size, data=data)
         data = self._receive()
-        return data[0], data[1:]
+        return data[0], bytearray(data[1:])
 
     def upload(self, size: int) -> bytearray:
         """Transfer data from slave to master.
@@ -227,7 +322,87 @@ class Master:
         """
         self._send(CommandCodes.UPLOAD, size=size)
         data = self._receive()
-        return data[:size]
+        return bytearray(data[:size])
+
+    def bulk_upload(self, size: int, window: int = 1) -> bytearray:
+        """Transfer a block of data of any size from slave to master.
+
+        The block is read from MTA0 with as many UPLOAD commands as needed,
+        each of which advances MTA0 in the slave. Up to window UPLOADs are
+        sent before waiting for their replies, which saves a round trip per
+        command. CCP slaves are only required to handle one command at a
+        time, so only raise window for slaves known to queue CROs.
+
+        Parameters
+        ----------
+        size : int
+            Number of bytes to be transferred.
+        window : int, optional
+            Maximum number of UPLOADs awaiting a reply. The default is 1.
+
+        Raises
+        ------
+        ValueError
+            If window is less than 1.
+        CCPError
+            If any UPLOAD fails. Replies to UPLOADs already sent are
+            discarded before raising.
+
+        Returns
+        -------
+        bytearray
+            <size> number of data bytes.
+        """
+        chunks = [
+            min(size - offset, _CRM_DATA_SIZE)
+            for offset in range(0, size, _CRM_DATA_SIZE)
+        ]
+        replies = self._send_batch(
+            ((CommandCodes.UPLOAD, {"size": chunk}) for chunk in chunks), window
+        )
+        return bytearray(b"".join(r[:c] for r, c in zip(replies, chunks)))
+
+    def bulk_dnload(self, data: bytes, window: int = 1) -> tuple:
+        """Transfer a block of data of any size from master to slave.
+
+        The block is written to MTA0 with as many DNLOAD commands as needed,
+        each of which advances MTA0 in the slave. See bulk_upload for window.
+
+        Parameters
+        ----------
+        data : bytes
+            Data to be written to MTA0 in the slave.
+        window : int, optional
+            Maximum number of DNLOADs awaiting a reply. The default is 1.
+
+        Raises
+        ------
+        ValueError
+            If data is empty, or if window is less than 1.
+        CCPError
+            If any DNLOAD fails. Replies to DNLOADs already sent are
+            discarded before raising.
+
+        Returns
+        -------
+        tuple
+             mta0_ext:  MTA0 extension after the last DNLOAD,
+             mta0_addr: MTA0 address after the last DNLOAD
+        """
+        if not data:
+            raise ValueError("No data to download")
+
+        commands = []
+
+        for offset in range(0, len(data), _CRM_DATA_SIZE):
+            chunk = data[offset : offset + _CRM_DATA_SIZE]
+            # DNLOAD's data parameter is sent big endian in five bytes, of
+            # which the slave reads the first <size>.
+            value = int.from_bytes(chunk.ljust(_CRM_DATA_SIZE, b"\0"), "big")
+            commands.append((CommandCodes.DNLOAD, {"size": len(chunk), "data": value}))
+
+        reply = self._send_batch(commands, window)[-1]
+        return reply[0], bytearray(reply[1:])
 
     def get_daq_size(self, daq_list_number: int, dto_id: int = None) -> tuple:
         """Return the size of the specified DAQ list.
@@ -294,6 +469,56 @@ class Master:
         )
         self._receive()
 
+    def write_daq_elements(
+        self, elements: Iterable[Tuple[int, int, int, int, int, int]], window: int = 1
+    ):
+        """Write several DAQ elements, each with set_daq_ptr and write_daq.
+
+        Up to window commands are sent before waiting for their replies. See
+        bulk_upload for window.
+
+        Parameters
+        ----------
+        elements : Iterable[Tuple[int, int, int, int, int, int]]
+            (daq_list_number, odt_number, element_number, size, extension,
+            address) for each element, in the order they are to be written.
+        window : int, optional
+            Maximum number of commands awaiting a reply. The default is 1.
+
+        Raises
+        ------
+        ValueError
+            If window is less than 1.
+        CCPError
+            If any command fails. Replies to commands already sent are
+            discarded before raising.
+
+        Returns
+        -------
+        None.
+        """
+        commands = []
+
+        for daq_list_number, odt_number, element_number, size, ext, addr in elements:
+            commands.append(
+                (
+                    CommandCodes.SET_DAQ_PTR,
+                    {
+                        "daq_list_number": daq_list_number,
+                        "odt_number": odt_number,
+                        "element_number": element_number,
+                    },
+                )
+            )
+            commands.append(
+                (
+                    CommandCodes.WRITE_DAQ,
+                    {"size": size, "extension": ext, "address": addr},
+                )
+            )
+
+        self._send_batch(commands, window)
+
     def start_stop(
         self,
         mode: int,
@@ -4,12 +4,21 @@
 """Base class for CCP messages plus some utility functions."""
 
 import can
-from copy import deepcopy
+from copy import copy
 import enum
 
 
 MAX_DLC = 8
 
+# can.Message attributes copied by CCPMessage.from_can_message. Resolved once
+# here rather than walking can.Message.__slots__ for every received frame.
+_MESSAGE_SLOTS = tuple(s for s in can.Message.__slots__ if not s[:2] == "__")
+# The slots holding mutable containers (the data bytearray, and on some
+# python-can versions a dict of extra attributes) get a copy of their own;
+# the rest hold immutable values which can simply be shared.
+_CONTAINER_SLOTS = tuple(s for s in _MESSAGE_SLOTS if s in ("data", "_dict"))
+_VALUE_SLOTS = tuple(s for s in _MESSAGE_SLOTS if s not in _CONTAINER_SLOTS)
+
 
 class MessageByte(enum.IntEnum):
     CRO_CMD = 0
@@ -24,6 +33,61 @@ class DTOType(enum.IntEnum):
     EVENT_MESSAGE = 0xFE
 
 
+# Plain ints for the per-frame PID checks; comparing against IntEnum members
+# is noticeably slower than comparing two ints.
+_CRM_PID = int(DTOType.COMMAND_RETURN_MESSAGE)
+_EVM_PID = int(DTOType.EVENT_MESSAGE)
+
+
+def member_table(enum_type: enum.EnumMeta) -> list:
+    """Build a list which maps every byte value to a member of enum_type.
+
+    Indexing the table is much cheaper than calling enum_type(value), which
+    matters for properties read once per received message.
+
+    Parameters
+    ----------
+    enum_type : enum.EnumMeta
+        An IntEnum whose values all fit in one byte.
+
+    Returns
+    -------
+    list
+        256 items, each either an enum_type member or None.
+    """
+    table = [None] * 0x100
+
+    for member in enum_type:
+        table[member] = member
+
+    return table
+
+
+def lookup_member(table: list, enum_type: enum.EnumMeta, value: int) -> enum.Enum:
+    """Look up value in a table built by member_table.
+
+    Parameters
+    ----------
+    table : list
+        Table returned by member_table(enum_type).
+    enum_type : enum.EnumMeta
+    value : int
+        Byte value to look up.
+
+    Raises
+    ------
+    ValueError
+        If value is not a member of enum_type.
+
+    Returns
+    -------
+    enum.Enum
+        The enum_type member with this value.
+    """
+    member = table[value]
+    return enum_type(value) if member is None else member
+
+
 def is_cro(msg: can.Message, cro_id: int,) -> bool:
     """Check if the message is a CommandReceiveObject.
 
@@ -75,9 +139,7 @@ def is_crm(msg: can.Message, dto_id: int,) -> bool:
     bool
         True if the message is a CommandReturnMessage, False otherwise.
     """
-    pid = msg.data[0]
-
-    return is_dto(dto_id=dto_id, msg=msg) and (pid == DTOType.COMMAND_RETURN_MESSAGE)
+    return msg.arbitration_id == dto_id and msg.data[0] == _CRM_PID
 
 
 def is_evm(msg: can.Message, dto_id: int,) -> bool:
@@ -95,9 +157,7 @@ def is_evm(msg: can.Message, dto_id: int,) -> bool:
     bool
         True if the message is a EventMessage, False otherwise.
     """
-    pid = msg.data[0]
-
-    return is_dto(dto_id=dto_id, msg=msg) and (pid == DTOType.EVENT_MESSAGE)
+    return msg.arbitration_id == dto_id and msg.data[0] == _EVM_PID
 
 
 def is_daq(msg: can.Message, dto_id: int,) -> bool:
@@ -115,9 +175,7 @@ def is_daq(msg: can.Message, dto_id: int,) -> bool:
     bool
         True if the message is a DataAcquisitionMessage, False otherwise.
     """
-    pid = msg.data[0]
-
-    return is_dto(dto_id=dto_id, msg=msg) and (pid < DTOType.EVENT_MESSAGE)
+    return msg.arbitration_id == dto_id and msg.data[0] < _EVM_PID
 
 
 def check_msg_type(msg: can.Message):
@@ -146,14 +204,20 @@ def check_msg_type(msg: can.Message):
 class CCPMessage(can.Message):
     """Base class for CCP messages."""
 
+    # All state lives in can.Message's slots, so skip the per-instance __dict__.
+    __slots__ = ()
+
     @classmethod
     def from_can_message(cls, msg: can.Message):
         """Copy constructor for creating CCP messages from CAN messages."""
         check_msg_type(msg)
-        ccpmsg = cls()
+        # Every attribute is assigned below, so skip cls.__init__.
+        ccpmsg = cls.__new__(cls)
+
+        for s in _VALUE_SLOTS:
+            setattr(ccpmsg, s, getattr(msg, s))
 
-        for s in can.Message.__slots__:
-            if not s[:2] == "__":
-                ccpmsg.__setattr__(s, deepcopy(msg.__getattribute__(s)))
+        for s in _CONTAINER_SLOTS:
+            setattr(ccpmsg, s, copy(getattr(msg, s)))
 
         return ccpmsg
@@ -3,12 +3,22 @@
 
 """A Command Receive Object (CRO)."""
 
+from collections.abc import Mapping
 from typing import Dict
+import functools
 import os
+import re
 import enum
+import struct
 import cantools
 
-from .ccp_message import CCPMessage, MAX_DLC, MessageByte
+from .ccp_message import (
+    CCPMessage,
+    MAX_DLC,
+    MessageByte,
+    lookup_member,
+    member_table,
+)
 
 
 class CommandCodes(enum.IntEnum):
@@ -44,44 +54,224 @@ class CommandCodes(enum.IntEnum):
     ACTION_SERVICE = 0x21
 
 
+_COMMAND_CODES = member_table(CommandCodes)
+
 _dir_path = os.path.dirname(os.path.realpath(__file__))
-COMMANDS_DB = cantools.database.load_file(os.path.join(_dir_path, "commands.dbc"))
 
-COMMAND_DISPATCH = {
+
+@functools.lru_cache(maxsize=1)
+def commands_db() -> cantools.database.Database:
+    """Load commands.dbc, the reference description of each command.
+
+    CROs are packed with COMMAND_LAYOUTS, so the database is only parsed the
+    first time it is asked for.
+
+    Returns
+    -------
+    cantools.database.Database
+    """
+    return cantools.database.load_file(os.path.join(_dir_path, "commands.dbc"))
+
+
+_DISPATCH_NAMES = {
+    # Mandatory commands
+    CommandCodes.CONNECT: "connect",
+    CommandCodes.GET_CCP_VERSION: "get_ccp_version",
+    CommandCodes.EXCHANGE_ID: "exchange_id",
+    CommandCodes.SET_MTA: "set_mta",
+    CommandCodes.DNLOAD: "dnload",
+    CommandCodes.UPLOAD: "upload",
+    CommandCodes.GET_DAQ_SIZE: "get_daq_size",
+    CommandCodes.SET_DAQ_PTR: "set_daq_ptr",
+    CommandCodes.WRITE_DAQ: "write_daq",
+    CommandCodes.START_STOP: "start_stop",
+    CommandCodes.DISCONNECT: "disconnect",
+    # Optional commands
+    # CommandCodes.GET_SEED: "get_seed",
+    # CommandCodes.UNLOCK: "unlock",
+    # CommandCodes.DNLOAD_6: "dnload_6",
+    # CommandCodes.SHORT_UP: "short_up",
+    # CommandCodes.SELECT_CAL_PAGE: "select_cal_page",
+    CommandCodes.SET_S_STATUS: "set_s_status",
+    # CommandCodes.GET_S_STATUS: "get_s_status",
+    # CommandCodes.BUILD_CHKSUM: "build_chksum",
+    # CommandCodes.CLEAR_MEMORY: "clear_memory",
+    # CommandCodes.PROGRAM: "program",
+    # CommandCodes.PROGRAM_6: "program_6",
+    # CommandCodes.MOVE: "move",
+    # CommandCodes.TEST: "test",
+    # CommandCodes.GET_ACTIVE_CAL_PAGE: "get_active_cal_page",
+    # CommandCodes.START_STOP_ALL: "start_stop_all",
+}
+
+
+class _CommandDispatch(Mapping):
+    """{CommandCodes: cantools message} view of commands_db(), loaded on use."""
+
+    def __getitem__(self, command_code: CommandCodes) -> cantools.database.Message:
+        return commands_db().get_message_by_name(_DISPATCH_NAMES[command_code])
+
+    def __iter__(self):
+        return iter(_DISPATCH_NAMES)
+
+    def __len__(self) -> int:
+        return len(_DISPATCH_NAMES)
+
+
+COMMAND_DISPATCH = _CommandDispatch()
+
+
+class CommandLayout:
+    """Byte layout of a CRO, packed and unpacked with a precompiled struct.
+
+    Every CRO starts with the command code and counter bytes, followed by the
+    command's parameters. Parameters without a matching struct integer code,
+    such as the five data bytes of DNLOAD, are declared as "Ns" and converted
+    with int.to_bytes/int.from_bytes.
+    """
+
+    def __init__(self, fmt: str, *parameters: str):
+        """Create a CommandLayout.
+
+        Parameters
+        ----------
+        fmt : str
+            struct format of the parameter bytes, including byte order prefix.
+        *parameters : str
+            Parameter names, in the same order as in fmt.
+
+        Returns
+        -------
+        None.
+        """
+        self.parameters = parameters
+        self._struct = struct.Struct(fmt[0] + "BB" + fmt[1:])
+        self._byteorder = "little" if fmt[0] == "<" else "big"
+        codes = [(n, c) for n, c in re.findall(r"(\d*)(\w)", fmt[1:]) if c != "x"]
+        self._wide = tuple(
+            (i, int(n)) for i, (n, c) in enumerate(codes, start=2) if c == "s"
+        )
+        # Unsigned range of each field, used to tell which value did not fit.
+        self._ranges = tuple(
+            (name, (1 << 8 * struct.calcsize(n + c)) - 1)
+            for name, (n, c) in zip(
+                ("command_code", "ctr") + parameters, [("", "B")] * 2 + codes
+            )
+        )
+
+    def pack_into(
+        self, buffer: bytearray, command_code: int, ctr: int, parameters: dict
+    ):
+        """Pack a CRO into buffer.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            At least MAX_DLC bytes long.
+        command_code : int
+        ctr : int
+        parameters : dict
+            {parameter name: value}-pairs for this command.
+
+        Raises
+        ------
+        OverflowError
+            If a value does not fit in its field.
+
+        Returns
+        -------
+        None.
+        """
+        values = [command_code, ctr]
+        values += [parameters[p] for p in self.parameters]
+
+        try:
+            for i, width in self._wide:
+                values[i] = values[i].to_bytes(width, self._byteorder)
+
+            self._struct.pack_into(buffer, 0, *values)
+        except (OverflowError, struct.error):
+            self._check_ranges(dict(parameters, command_code=command_code, ctr=ctr))
+            raise
+
+    def _check_ranges(self, values: dict):
+        for name, maximum in self._ranges:
+            value = values[name]
+
+            if isinstance(value, int) and not 0 <= value <= maximum:
+                raise OverflowError("{} out of range: {}".format(name, value)) from None
+
+    def unpack(self, data: bytearray) -> Dict[str, int]:
+        """Unpack a CRO.
+
+        Parameters
+        ----------
+        data : bytearray
+            CRO data.
+
+        Returns
+        -------
+        Dict[str, int]
+            Dictionary of {keyword: value}-pairs, including command_code and ctr.
+        """
+        values = list(self._struct.unpack_from(data))
+
+        for i, _ in self._wide:
+            values[i] = int.from_bytes(values[i], self._byteorder)
+
+        return dict(zip(("command_code", "ctr") + self.parameters, values))
+
+
+# Precompiled equivalents of the messages in commands.dbc, which remains the
+# reference description of each command.
+COMMAND_LAYOUTS = {
     # Mandatory commands
-    CommandCodes.CONNECT: COMMANDS_DB.get_message_by_name("connect"),
-    CommandCodes.GET_CCP_VERSION: COMMANDS_DB.get_message_by_name("get_ccp_version"),
-    CommandCodes.EXCHANGE_ID: COMMANDS_DB.get_message_by_name("exchange_id"),
-    CommandCodes.SET_MTA: COMMANDS_DB.get_message_by_name("set_mta"),
-    CommandCodes.DNLOAD: COMMANDS_DB.get_message_by_name("dnload"),
-    CommandCodes.UPLOAD: COMMANDS_DB.get_message_by_name("upload"),
-    CommandCodes.GET_DAQ_SIZE: COMMANDS_DB.get_message_by_name("get_daq_size"),
-    CommandCodes.SET_DAQ_PTR: COMMANDS_DB.get_message_by_name("set_daq_ptr"),
-    CommandCodes.WRITE_DAQ: COMMANDS_DB.get_message_by_name("write_daq"),
-    CommandCodes.START_STOP: COMMANDS_DB.get_message_by_name("start_stop"),
-    CommandCodes.DISCONNECT: COMMANDS_DB.get_message_by_name("disconnect"),
+    CommandCodes.CONNECT: CommandLayout("<H4x", "station_address"),
+    CommandCodes.GET_CCP_VERSION: CommandLayout("<BB4x", "major", "minor"),
+    CommandCodes.EXCHANGE_ID: CommandLayout("<6s", "device_info"),
+    CommandCodes.SET_MTA: CommandLayout(">BBI", "mta", "extension", "address"),
+    CommandCodes.DNLOAD: CommandLayout(">B5s", "size", "data"),
+    CommandCodes.UPLOAD: CommandLayout("<B5x", "size"),
+    CommandCodes.GET_DAQ_SIZE: CommandLayout(">BxI", "daq_list_number", "dto_id"),
+    CommandCodes.SET_DAQ_PTR: CommandLayout(
+        "<BBB3x", "daq_list_number", "odt_number", "element_number"
+    ),
+    CommandCodes.WRITE_DAQ: CommandLayout(">BBI", "size", "extension", "address"),
+    CommandCodes.START_STOP: CommandLayout(
+        ">BBBBH",
+        "mode",
+        "daq_list_number",
+        "last_odt_number",
+        "event_channel",
+        "rate_prescaler",
+    ),
+    CommandCodes.DISCONNECT: CommandLayout("<BxH2x", "permanent", "station_address"),
     # Optional commands
-    # CommandCodes.GET_SEED: getSeed,
-    # CommandCodes.UNLOCK: unlock,
-    # CommandCodes.DNLOAD_6: dnload6,
-    # CommandCodes.SHORT_UP: shortUp,
-    # CommandCodes.SELECT_CAL_PAGE: selectCalPage,
-    CommandCodes.SET_S_STATUS: COMMANDS_DB.get_message_by_name("set_s_status"),
-    # CommandCodes.GET_S_STATUS: getSStatus,
-    # CommandCodes.BUILD_CHKSUM: buildChksum,
-    # CommandCodes.CLEAR_MEMORY: clearMemory,
-    # CommandCodes.PROGRAM: program,
-    # CommandCodes.PROGRAM_6: program6,
-    # CommandCodes.MOVE: move,
-    # CommandCodes.TEST: test,
-    # CommandCodes.GET_ACTIVE_CAL_PAGE: getActiveCalPage,
-    # CommandCodes.START_STOP_ALL: startStopAll,
+    CommandCodes.SET_S_STATUS: CommandLayout("<B5x", "status_bits"),
 }
 
+# COMMAND_LAYOUTS indexed directly by command byte, which spares every CRO a
+# dict lookup keyed on an IntEnum.
+_LAYOUT_TABLE = [None] * 0x100
+
+for _code, _layout in COMMAND_LAYOUTS.items():
+    _LAYOUT_TABLE[_code] = _layout
+
+
+def _get_layout(command_code: int) -> CommandLayout:
+    layout = _LAYOUT_TABLE[command_code]
+
+    if layout is None:
+        raise ValueError("Unsupported command {}".format(command_code))
+
+    return layout
+
 
 class CommandReceiveObject(CCPMessage):
     """CROs hold commands from the master to the slave."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         arbitration_id: int = 0,
@@ -100,6 +290,13 @@ class CommandReceiveObject(CCPMessage):
         **kwargs : int
             Keyword arguments for the command specified by command_code.
 
+        Raises
+        ------
+        ValueError
+            If command_code is not supported by this implementation.
+        OverflowError
+            If a parameter does not fit in its field.
+
         Returns
         -------
         None.
@@ -109,10 +306,38 @@ class CommandReceiveObject(CCPMessage):
         self.ctr = ctr
 
         if command_code is not None:
-            self.data = self.encode(**kwargs)
+            self.pack(command_code, ctr, **kwargs)
 
         super().__init__(arbitration_id=arbitration_id, data=self.data)
 
+    def pack(self, command_code: CommandCodes, ctr: int, **kwargs: int):
+        """Overwrite this CRO in place with a new command.
+
+        Lets a sender reuse one CRO instead of constructing a new one for
+        every command.
+
+        Parameters
+        ----------
+        command_code : CommandCodes
+            The command to send to the slave.
+        ctr : int
+            Command counter, 0-0xFF. Used to associate CROs with CRMs.
+        **kwargs : int
+            Keyword arguments for the command specified by command_code.
+
+        Raises
+        ------
+        ValueError
+            If command_code is not supported by this implementation.
+        OverflowError
+            If a parameter does not fit in its field.
+
+        Returns
+        -------
+        None.
+        """
+        _get_layout(command_code).pack_into(self.data, command_code, ctr, kwargs)
+
     def encode(self, **kwargs: int) -> bytes:
         """Encode keyword arguments to bytes.
 
@@ -121,16 +346,21 @@ class CommandReceiveObject(CCPMessage):
         **kwargs : int
             Keyword arguments for the command specified by command_code.
 
+        Raises
+        ------
+        OverflowError
+            If a parameter does not fit in its field.
+
         Returns
         -------
         bytes
             Encoded data ready to be transmitted on the CAN bus.
         """
-        parameters = kwargs
-        parameters["command_code"] = self.command_code
-        parameters["ctr"] = self.ctr
-
-        return COMMAND_DISPATCH[self.command_code].encode(parameters)
+        data = bytearray(MAX_DLC)
+        _get_layout(self.command_code).pack_into(
+            data, self.command_code, self.ctr, kwargs
+        )
+        return bytes(data)
 
     def decode(self) -> Dict[str, int]:
         """Decode data bytes to find the keyword arguments used to generate them.
@@ -140,12 +370,13 @@ class CommandReceiveObject(CCPMessage):
         Dict[str, int]
             Dictionary of {keyword: value}-pairs.
         """
-        return COMMAND_DISPATCH[self.command_code].decode(self.data)
+        return _get_layout(self.command_code).unpack(self.data)
 
     @property
     def command_code(self) -> CommandCodes:
         """Get the CRO's command_code."""
-        return CommandCodes(self.data[MessageByte.CRO_CMD])
+        value = self.data[MessageByte.CRO_CMD]
+        return lookup_member(_COMMAND_CODES, CommandCodes, value)
 
     @command_code.setter
     def command_code(self, value: CommandCodes):
@@ -5,7 +5,13 @@
 
 import enum
 
-from .ccp_message import DTOType, MAX_DLC, MessageByte
+from .ccp_message import (
+    DTOType,
+    MAX_DLC,
+    MessageByte,
+    lookup_member,
+    member_table,
+)
 from .data_transmission import DataTransmissionObject
 
 
@@ -30,9 +36,14 @@ class ReturnCodes(enum.IntEnum):
     RESOURCE_FUNCTION_NOT_AVAILABLE = 0x36  # C3 FAULT
 
 
+_RETURN_CODES = member_table(ReturnCodes)
+
+
 class CommandReturnMessage(DataTransmissionObject):
     """CRMs are sent by the slave in response to a CRO."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         arbitration_id: int = 0,
@@ -53,19 +64,19 @@ class CommandReturnMessage(DataTransmissionObject):
         -------
         None.
         """
-        self.data = data
-        self.return_code = return_code
-        self.ctr = ctr
         super().__init__(
             arbitration_id=arbitration_id,
             pid=DTOType.COMMAND_RETURN_MESSAGE,
-            data=self.data,
+            data=data,
         )
+        self.return_code = return_code
+        self.ctr = ctr
 
     @property
     def return_code(self) -> ReturnCodes:
         """Get the CRM's return_code."""
-        return ReturnCodes(self.data[MessageByte.DTO_ERR])
+        value = self.data[MessageByte.DTO_ERR]
+        return lookup_member(_RETURN_CODES, ReturnCodes, value)
 
     @return_code.setter
     def return_code(self, value: ReturnCodes):
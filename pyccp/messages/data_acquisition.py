@@ -5,6 +5,7 @@
 import cantools
 import enum
 import decimal
+import struct
 from typing import Dict, List, Union
 
 from .ccp_message import MAX_DLC
@@ -14,6 +15,8 @@ from .data_transmission import DataTransmissionObject
 class DataAcquisitionMessage(DataTransmissionObject):
     """A DTO sent from slave to master during a data acquisition session."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         arbitration_id: int = 0,
@@ -54,12 +57,13 @@ class DataAcquisitionMessage(DataTransmissionObject):
             A dictionary with {name: decoded value}-pairs for all Elements in
             this message.
         """
-        try:
-            return DAQ_DB.get_message_by_name(str(self.odt_number)).decode(
-                self.data[1:]
-            )
-        except KeyError as e:
-            raise KeyError("No ODT with number {}".format(e))
+        odt_number = self.data[0]
+        odt = _ODT_TABLE[odt_number] if odt_number < len(_ODT_TABLE) else None
+
+        if odt is None:
+            raise KeyError("No ODT with number {}".format(odt_number))
+
+        return odt.decode(memoryview(self.data)[1:])
 
     @property
     def odt_number(self) -> int:
@@ -177,6 +181,16 @@ class Element(cantools.database.Signal):
         self._start = value * 8 + 7 if self.byte_order == "big_endian" else value * 8
 
 
+def _struct_code(element: Element) -> str:
+    """Return the struct format character for element, or None if there is none."""
+    if element.is_float:
+        return {4: "f", 8: "d"}.get(element.size)
+
+    code = {1: "b", 2: "h", 4: "i", 8: "q"}.get(element.size)
+
+    return code if code is None or element.is_signed else code.upper()
+
+
 class ObjectDescriptorTable(cantools.database.Message):
     """Object Descriptor Tables (ODT) describe the layout of DAQ messages."""
 
@@ -220,16 +234,119 @@ class ObjectDescriptorTable(cantools.database.Message):
             e.start_byte = start_byte
             start_byte += e.size
 
+    def _compile_decoder(self):
+        # Unless elements need cantools' bit-level handling (choices, odd
+        # sizes, mixed byte orders, overlapping or out of order placement)
+        # the whole ODT can be unpacked by one struct, with pad bytes for
+        # any gaps between elements.
+        codes = []
+        offset = 0
+
+        for e in self.elements:
+            code = _struct_code(e)
+
+            if code is None or e.start_byte < offset:
+                codes = None
+                break
+
+            if e.start_byte > offset:
+                codes.append("{}x".format(e.start_byte - offset))
+
+            codes.append(code)
+            offset = e.start_byte + e.size
+
+        byte_orders = {e.byte_order for e in self.elements}
+        choices = any(e.choices for e in self.elements)
+
+        if codes is None or offset > self.length or len(byte_orders) > 1 or choices:
+            self._decoder = None
+            return
+
+        prefix = "<" if byte_orders == {"little_endian"} else ">"
+        self._decoder = struct.Struct(prefix + "".join(codes))
+        # Element attributes as parallel tuples, so that decoding reads them
+        # positionally instead of through the Signal properties.
+        self._names = tuple(e.name for e in self.elements)
+        self._scales = tuple(e.scale for e in self.elements)
+        self._offsets = tuple(e.offset for e in self.elements)
+        # Integer scale 1 and offset 0 leave both value and type unchanged.
+        self._unscaled = all(
+            type(s) is int and s == 1 and type(o) is int and o == 0
+            for s, o in zip(self._scales, self._offsets)
+        )
+
+    def refresh(self, strict: bool = None):
+        """Refresh the internal ODT state after its elements have changed."""
+        super().refresh(strict)
+        self._compile_decoder()
+
+    def decode(
+        self, data: bytearray, decode_choices: bool = True, scaling: bool = True
+    ) -> Dict[str, Union[int, float, str]]:
+        """Decode the data of a DAQ message which uses this ODT.
+
+        Parameters
+        ----------
+        data : bytearray
+            DAQ message data, excluding the PID byte.
+        decode_choices : bool, optional
+            See cantools.database.can.Message.decode. The default is True.
+        scaling : bool, optional
+            See cantools.database.can.Message.decode. The default is True.
+
+        Raises
+        ------
+        ValueError
+            If data is shorter than the ODT.
+
+        Returns
+        -------
+        Dict[str, Union[int, float, str]]
+            A dictionary with {name: decoded value}-pairs for all Elements.
+        """
+        if self._decoder is None:
+            return super().decode(data, decode_choices, scaling)
+
+        # Same check, and message, as cantools.
+        if len(data) < self.length:
+            raise ValueError("Short data.")
+
+        values = self._decoder.unpack_from(data)
+
+        if self._unscaled or not scaling:
+            return dict(zip(self._names, values))
+
+        return {
+            n: s * v + o
+            for n, s, o, v in zip(self._names, self._scales, self._offsets, values)
+        }
+
     def register(self):
-        """Register this ODT with DAQ_DB."""
+        """Register this ODT with DAQ_DB.
+
+        Raises
+        ------
+        ValueError
+            If the ODT number is not a DAQ PID, 0-0xFD.
+        """
+        if not 0 <= self.number < len(_ODT_TABLE):
+            raise ValueError("Invalid ODT number {}".format(self.number))
+
         DAQ_DB.messages.append(self)
         DAQ_DB.refresh()
+        _ODT_TABLE[self.number] = self
 
     def deregister(self):
         """Remove this ODT from DAQ_DB."""
         DAQ_DB.messages.remove(self)
         DAQ_DB.refresh()
 
+        # Fall back on any other ODT still registered under the same number.
+        try:
+            _ODT_TABLE[self.number] = DAQ_DB.get_message_by_name(self.name)
+        except KeyError:
+            _ODT_TABLE[self.number] = None
+
     @property
     def number(self):
         """Get the ODT number."""
@@ -246,3 +363,7 @@ class ObjectDescriptorTable(cantools.database.Message):
 
 
 DAQ_DB = cantools.database.Database()
+
+# Registered ODTs indexed by ODT number, so that decoding a DAQ message does
+# not need a by-name lookup in DAQ_DB. PIDs 0xFE and 0xFF are not DAQ.
+_ODT_TABLE = [None] * 0xFE
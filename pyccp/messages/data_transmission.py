@@ -4,9 +4,12 @@
 """A Data Transmission Object (DTO)."""
 
 from typing import Union
-from copy import deepcopy
 
-from .ccp_message import CCPMessage, DTOType, MessageByte
+from .ccp_message import CCPMessage, DTOType, MAX_DLC, MessageByte
+
+# Maps 0xFE/0xFF to their DTOType members without going through
+# EnumMeta.__call__ and its validation.
+_DTO_TYPES = DTOType._value2member_map_
 
 
 class DataTransmissionObject(CCPMessage):
@@ -22,6 +25,8 @@ class DataTransmissionObject(CCPMessage):
     and DAQ classes.
     """
 
+    __slots__ = ()
+
     def __init__(
         self, arbitration_id: int, pid: Union[DTOType, int], data: bytearray,
     ):
@@ -34,27 +39,32 @@ class DataTransmissionObject(CCPMessage):
             0xFE for EVM,
             0-0xFD for DAQ.
         data : list of int or bytearray, optional
-            Transmitted data.
+            Transmitted data. Copied, so the caller's buffer is never shared
+            between instances.
+
+        Raises
+        ------
+        ValueError
+            If data is longer than a CAN frame.
 
         Returns
         -------
         None.
         """
-        # Not sure why deepcopy is necessary here, but without it the data slot
-        # is sometimes (?) shared between instances.
-        self.data = deepcopy(data)
+        if len(data) > MAX_DLC:
+            raise ValueError(
+                "DTO data must be {} bytes or fewer, got {}".format(MAX_DLC, len(data))
+            )
+
+        self.data = bytearray(data)
         self.pid = pid
         super().__init__(arbitration_id=arbitration_id, data=self.data)
 
     @property
     def pid(self) -> Union[DTOType, int]:
         """Get the DTO's PID value."""
-        ret = self.data[MessageByte.DTO_PID]
-
-        if ret >= DTOType.EVENT_MESSAGE:
-            ret = DTOType(ret)
-
-        return ret
+        pid = self.data[MessageByte.DTO_PID]
+        return _DTO_TYPES.get(pid, pid)
 
     @pid.setter
     def pid(self, value: Union[DTOType, int]):
@@ -3,14 +3,19 @@
 
 """An Event Message (EVM)."""
 
-from .ccp_message import DTOType, MAX_DLC, MessageByte
+from .ccp_message import DTOType, MAX_DLC, MessageByte, lookup_member
 from .data_transmission import DataTransmissionObject
-from .command_return import ReturnCodes
+from .command_return import ReturnCodes, _RETURN_CODES
+
+# Shared, immutable template; DataTransmissionObject copies it per instance.
+_EMPTY_DATA = bytes(MAX_DLC)
 
 
 class EventMessage(DataTransmissionObject):
     """EVMs are sent by the slave in response to an internal event."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         arbitration_id: int = 0,
@@ -27,16 +32,16 @@ class EventMessage(DataTransmissionObject):
         -------
         None.
         """
-        self.data = bytearray(MAX_DLC)
-        self.return_code = return_code
         super().__init__(
-            arbitration_id=arbitration_id, pid=DTOType.EVENT_MESSAGE, data=self.data,
+            arbitration_id=arbitration_id, pid=DTOType.EVENT_MESSAGE, data=_EMPTY_DATA,
         )
+        self.return_code = return_code
 
     @property
     def return_code(self) -> ReturnCodes:
         """Get the EVM's return_code."""
-        return ReturnCodes(self.data[MessageByte.DTO_ERR])
+        value = self.data[MessageByte.DTO_ERR]
+        return lookup_member(_RETURN_CODES, ReturnCodes, value)
 
     @return_code.setter
     def return_code(self, value: ReturnCodes):
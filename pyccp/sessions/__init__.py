@@ -1 +1 @@
-from .daq_session import DAQSession
+from .daq_session import DAQSession, SessionStatus
@@ -24,9 +24,25 @@ class SessionStatus(enum.IntEnum):
 class DAQSession:
     """During a DAQ session, the slave periodically sends internal variable values."""
 
-    def __init__(self, master: Master, station_address: int):
+    def __init__(self, master: Master, station_address: int, window: int = 1):
+        """Create a DAQSession.
+
+        Parameters
+        ----------
+        master : Master
+        station_address : int
+            Station address of the slave device.
+        window : int, optional
+            Maximum number of DAQ setup commands awaiting a reply, see
+            Master.write_daq_elements. The default is 1.
+
+        Returns
+        -------
+        None.
+        """
         self.master = master
         self.station_address = station_address
+        self.window = window
         self.odts = []
         self.daq_lists = []
         self._initialized = False
@@ -91,6 +107,8 @@ class DAQSession:
     def _set_daq_lists(self):
         self.master.set_s_status(status_bits=SessionStatus.CAL)
 
+        elements = []
+
         j = 0
         for i, dl in enumerate(self.daq_lists):
             for j, odt in enumerate(self.odts[j:], start=j):
@@ -98,11 +116,9 @@ class DAQSession:
                     break
 
                 for k, e in enumerate(odt.elements):
-                    self.master.set_daq_ptr(
-                        daq_list_number=i, odt_number=j, element_number=k
-                    )
-                    self.master.write_daq(e.size, e.extension, e.address)
+                    elements.append((i, j, k, e.size, e.extension, e.address))
 
+        self.master.write_daq_elements(elements, self.window)
         self.master.set_s_status(status_bits=SessionStatus.CAL | SessionStatus.DAQ)
 
     def initialize(self, elements: List[Element]):
@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import can
+import queue
+import threading
 import unittest
 
 from pyccp.listeners import MessageSorter
@@ -23,7 +25,7 @@ class TestListeners(unittest.TestCase):
         self.dto_id = 0x321
         self.master_bus = can.Bus("test", bustype="virtual", receive_own_messages=True)
         self.slave_bus = can.Bus("test", bustype="virtual")
-        self.sorter = MessageSorter(self.dto_id, self.cro_id)
+        self.sorter = MessageSorter(self.dto_id, self.cro_id, track_cro=True)
         test_signal = Element(name="testSignal", size=4, address=0xDEADBEEF,)
         self.test_odt = ObjectDescriptorTable(elements=[test_signal], number=2)
         self.test_odt.register()
@@ -42,6 +44,36 @@ class TestListeners(unittest.TestCase):
         msg.channel = None
         self.assertTrue(crm.equals(msg, timestamp_delta=None))
 
+    def testLogCRM(self):
+        crm = CommandReturnMessage(
+            arbitration_id=self.dto_id, ctr=0x27, return_code=ReturnCodes.ACKNOWLEDGE,
+        )
+        crm.data[3:] = bytearray(range(0x0E, 0x13))
+
+        with self.assertLogs("pyccp.listeners.message_sorter", "DEBUG") as cm:
+            self.sorter.on_message_received(crm)
+
+        self.assertEqual(
+            cm.output,
+            [
+                "DEBUG:pyccp.listeners.message_sorter:"
+                "Received CRM 39:  ACKNOWLEDGE  0e 0f 10 11 12"
+            ],
+        )
+
+    def testLogUnknownReturnCode(self):
+        evm = EventMessage(
+            arbitration_id=self.dto_id, return_code=ReturnCodes.DAQ_PROCESSOR_OVERLOAD,
+        )
+        evm.data[1] = 0xAA
+
+        with self.assertLogs("pyccp.listeners.message_sorter", "DEBUG") as cm:
+            self.sorter.on_message_received(evm)
+
+        self.assertEqual(
+            cm.output, ["DEBUG:pyccp.listeners.message_sorter:Received EVM:  0xAA"]
+        )
+
     def testReceiveEVM(self):
         evm = EventMessage(
             arbitration_id=self.dto_id, return_code=ReturnCodes.DAQ_PROCESSOR_OVERLOAD,
@@ -71,6 +103,16 @@ class TestListeners(unittest.TestCase):
         msg.channel = None
         self.assertTrue(cro.equals(msg, timestamp_delta=None))
 
+    def testIgnoreCRO(self):
+        sorter = MessageSorter(self.dto_id, self.cro_id)
+        cro = CommandReceiveObject(
+            arbitration_id=self.cro_id, command_code=CommandCodes.UPLOAD, size=1,
+        )
+        sorter.on_message_received(cro)
+        self.assertRaises(RuntimeError, sorter.get_command_receive_object)
+        sorter.track_cro = True
+        self.assertRaises(queue.Empty, sorter.get_command_receive_object, timeout=0)
+
     def testParseDAQ(self):
         daq = DataAcquisitionMessage(arbitration_id=self.dto_id, odt_number=2,)
         daq.data[1:] = bytearray(range(7))
@@ -79,6 +121,46 @@ class TestListeners(unittest.TestCase):
         value = msg.decode()["testSignal"]
         self.assertEqual(value, 0x10203)
 
+    def testReceiveDAQBatch(self):
+        for i in range(3):
+            daq = DataAcquisitionMessage(arbitration_id=self.dto_id, odt_number=2,)
+            daq.data[1] = i
+            self.sorter.on_message_received(daq)
+
+        batch = self.sorter.get_data_acquisition_messages(max_count=2)
+        self.assertEqual([msg.data[1] for msg in batch], [0, 1])
+        batch = self.sorter.get_data_acquisition_messages()
+        self.assertEqual([msg.data[1] for msg in batch], [2])
+
+    def testReceiveBatchMaxCount(self):
+        daq = DataAcquisitionMessage(arbitration_id=self.dto_id, odt_number=2,)
+        self.sorter.on_message_received(daq)
+
+        for max_count in (0, -1):
+            self.assertRaises(
+                ValueError,
+                self.sorter.get_data_acquisition_messages,
+                max_count=max_count,
+            )
+            self.assertRaises(
+                ValueError, self.sorter.get_command_return_messages, max_count=max_count
+            )
+
+        self.assertEqual(len(self.sorter.get_data_acquisition_messages()), 1)
+
+    def testReceiveTimeout(self):
+        self.assertRaises(queue.Empty, self.sorter.get_event_message, timeout=0.01)
+
+    def testReceiveWhileWaiting(self):
+        evm = EventMessage(
+            arbitration_id=self.dto_id, return_code=ReturnCodes.DAQ_PROCESSOR_OVERLOAD,
+        )
+        timer = threading.Timer(0.05, self.sorter.on_message_received, [evm])
+        timer.start()
+        msg = self.sorter.get_event_message(timeout=5)
+        timer.join()
+        self.assertEqual(msg.return_code, ReturnCodes.DAQ_PROCESSOR_OVERLOAD)
+
 
 if __name__ == "__main__":
     unittest.main()  # pragma: no cover
@@ -3,6 +3,7 @@
 
 import can
 import unittest
+import weakref
 
 from pyccp import Master
 from pyccp.error import CCPError
@@ -40,6 +41,20 @@ class TestMaster(unittest.TestCase):
         )
         self.assertEqual(result, expected_result)
 
+    def queueReplies(self, return_codes, payloads=None):
+        # One CRM per return code, with consecutive counters from master.ctr.
+        payloads = payloads or [None] * len(return_codes)
+
+        for j, (return_code, payload) in enumerate(zip(return_codes, payloads)):
+            reply = CommandReturnMessage(
+                arbitration_id=0x321, return_code=return_code, ctr=self.master.ctr + j,
+            )
+
+            if payload is not None:
+                reply.data[3:] = payload
+
+            self.master._queue.on_message_received(reply)
+
     def testConnect(self):
         self.runTest(
             self.master.connect,
@@ -150,6 +165,105 @@ class TestMaster(unittest.TestCase):
             status_bits=0x01,
         )
 
+    def testConsecutiveCommands(self):
+        self.runTest(
+            self.master.dnload,
+            "000007E1  03 27 05 10 11 12 13 14",
+            self.acknowledge,
+            size=5,
+            data=0x1011121314,
+        )
+        reply = CommandReturnMessage(
+            arbitration_id=0x321,
+            return_code=ReturnCodes.ACKNOWLEDGE,
+            ctr=self.master.ctr,
+        )
+        self.runTest(
+            self.master.upload, "000007E1  04 28 04 00 00 00 00 00", reply, size=4,
+        )
+
+    def testBulkUpload(self):
+        for i, window in enumerate((1, 2)):
+            self.queueReplies(
+                [ReturnCodes.ACKNOWLEDGE] * 2, [range(0, 5), range(5, 10)]
+            )
+
+            data = self.master.bulk_upload(size=7, window=window)
+            self.assertEqual(data, bytearray(range(7)))
+            sent = [self.slave_bus.recv(timeout=1).data for _ in range(2)]
+            ctr = 0x27 + 2 * i
+            self.assertEqual(sent[0][:3], bytearray([0x04, ctr, 5]))
+            self.assertEqual(sent[1][:3], bytearray([0x04, ctr + 1, 2]))
+
+    def testBulkDnload(self):
+        self.queueReplies(
+            [ReturnCodes.ACKNOWLEDGE] * 2,
+            [[0, 0x10, 0x20, 0x30, 0x40], [0, 0x10, 0x20, 0x30, 0x45]],
+        )
+
+        mta0 = self.master.bulk_dnload(bytes(range(1, 8)), window=2)
+        self.assertEqual(mta0, (0, bytearray([0x10, 0x20, 0x30, 0x45])))
+        sent = [self.slave_bus.recv(timeout=1).data for _ in range(2)]
+        self.assertEqual(sent[0], bytearray([0x03, 0x27, 5, 1, 2, 3, 4, 5]))
+        self.assertEqual(sent[1], bytearray([0x03, 0x28, 2, 6, 7, 0, 0, 0]))
+
+    def testBulkUploadError(self):
+        self.queueReplies([ReturnCodes.ACCESS_DENIED, ReturnCodes.ACKNOWLEDGE])
+
+        self.assertRaises(CCPError, self.master.bulk_upload, size=10, window=2)
+
+        for _ in range(2):
+            self.slave_bus.recv(timeout=1)
+
+        # The reply to the second UPLOAD was discarded with the batch.
+        reply = CommandReturnMessage(
+            arbitration_id=0x321,
+            return_code=ReturnCodes.ACKNOWLEDGE,
+            ctr=self.master.ctr,
+        )
+        self.runTest(
+            self.master.upload, "000007E1  04 28 04 00 00 00 00 00", reply, size=4,
+        )
+
+    def testBulkUploadWindow(self):
+        self.assertRaises(ValueError, self.master.bulk_upload, size=10, window=0)
+        self.assertIsNone(self.slave_bus.recv(timeout=0.1))
+        self.assertEqual(self.master._pending, 0)
+
+    def testWriteDaqElements(self):
+        self.queueReplies([ReturnCodes.ACKNOWLEDGE] * 4)
+
+        elements = [(3, 5, 0, 2, 1, 0x02004200), (3, 5, 1, 4, 0, 0x1000)]
+        self.master.write_daq_elements(elements, window=2)
+        sent = [self.slave_bus.recv(timeout=1).data for _ in range(4)]
+        self.assertEqual(sent[0], bytearray([0x15, 0x27, 3, 5, 0, 0, 0, 0]))
+        self.assertEqual(sent[1], bytearray([0x16, 0x28, 2, 1, 2, 0, 0x42, 0]))
+        self.assertEqual(sent[2], bytearray([0x15, 0x29, 3, 5, 1, 0, 0, 0]))
+        self.assertEqual(sent[3], bytearray([0x16, 0x2A, 4, 0, 0, 0, 0x10, 0]))
+        self.assertEqual(self.master.ctr, 0x2B)
+
+    def testWriteDaqElementsPackError(self):
+        # Replies to everything sent before the second WRITE_DAQ fails to pack.
+        self.queueReplies([ReturnCodes.ACKNOWLEDGE] * 3)
+        elements = [(3, 5, 0, 2, 1, 0x1000), (3, 5, 1, 4, 0, -1)]
+        self.assertRaises(
+            OverflowError, self.master.write_daq_elements, elements, window=2
+        )
+
+        for _ in range(3):
+            self.slave_bus.recv(timeout=1)
+
+        reply = CommandReturnMessage(
+            arbitration_id=0x321,
+            return_code=ReturnCodes.ACKNOWLEDGE,
+            ctr=self.master.ctr,
+        )
+        self.runTest(
+            self.master.upload, "000007E1  04 29 04 00 00 00 00 00", reply, size=4,
+        )
+
+        self.assertIs(weakref.ref(self.master)(), self.master)
+
     def testNoReply(self):
         self.assertRaises(CCPError, self.master._receive)
 
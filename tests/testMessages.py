@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import can
+import cantools
+import unittest
+
+from pyccp.messages.command_receive import COMMAND_DISPATCH, COMMAND_LAYOUTS
+from pyccp.messages.data_acquisition import DAQ_DB
+from pyccp.messages import (
+    CommandCodes,
+    ReturnCodes,
+    CommandReceiveObject,
+    CommandReturnMessage,
+    DataAcquisitionMessage,
+    Element,
+    ObjectDescriptorTable,
+)
+
+
+class TestMessages(unittest.TestCase):
+    def testLayoutsMatchDatabase(self):
+        pattern = int.from_bytes(bytes(range(1, 9)), "big")
+
+        for command_code, layout in COMMAND_LAYOUTS.items():
+            db_message = COMMAND_DISPATCH[command_code]
+            parameters = {
+                p: pattern & ((1 << db_message.get_signal_by_name(p).length) - 1)
+                for p in layout.parameters
+            }
+            cro = CommandReceiveObject(
+                command_code=command_code, ctr=0x27, **parameters
+            )
+            expected = db_message.encode(
+                dict(parameters, command_code=command_code, ctr=0x27)
+            )
+            self.assertEqual(bytes(cro.data), expected)
+            self.assertEqual(cro.decode(), db_message.decode(expected))
+
+    def testODTDecodeMatchesDatabase(self):
+        data = bytes(range(0xF0, 0xF7))
+        tables = [
+            [
+                Element(name="a", size=4, address=0, is_signed=True, scale=2),
+                Element(name="b", size=2, address=1, offset=-1),
+                Element(name="c", size=1, address=2, is_signed=True),
+            ],
+            [
+                Element(name="d", size=4, address=3, is_float=True),
+                Element(name="e", size=2, address=4, byte_order="little_endian"),
+            ],
+            [Element(name="f", size=3, address=5)],
+        ]
+
+        for number, elements in enumerate(tables):
+            odt = ObjectDescriptorTable(elements=elements, number=number)
+            expected = cantools.database.Message.decode(odt, data)
+            self.assertEqual(odt.decode(data), expected)
+
+            with self.assertRaisesRegex(ValueError, "Short data"):
+                cantools.database.Message.decode(odt, data[:6])
+
+            with self.assertRaisesRegex(ValueError, "Short data"):
+                odt.decode(data[:6])
+
+        # Elements moved off their packed positions, leaving gaps between them.
+        for start_bytes in ((0, 3), (2, 4), (1, 5)):
+            elements = [
+                Element(name="a", size=2, address=0),
+                Element(name="b", size=2, address=1),
+            ]
+            odt = ObjectDescriptorTable(elements=elements, number=0)
+
+            for element, start_byte in zip(elements, start_bytes):
+                element.start_byte = start_byte
+
+            odt.refresh()
+            expected = cantools.database.Message.decode(odt, data)
+            self.assertEqual(odt.decode(data), expected)
+
+    def testUnsupportedCommand(self):
+        self.assertRaises(
+            ValueError, CommandReceiveObject, command_code=CommandCodes.TEST
+        )
+
+    def testParameterOutOfRange(self):
+        for command_code, parameters in (
+            (CommandCodes.UPLOAD, {"size": 0x100}),
+            (CommandCodes.SET_MTA, {"mta": 0, "extension": 0, "address": -1}),
+            (CommandCodes.DNLOAD, {"size": 5, "data": 1 << 40}),
+        ):
+            name = list(parameters)[-1]
+
+            with self.assertRaisesRegex(OverflowError, name):
+                CommandReceiveObject(command_code=command_code, **parameters)
+
+        with self.assertRaisesRegex(OverflowError, "ctr"):
+            CommandReceiveObject().pack(CommandCodes.UPLOAD, 0x100, size=1)
+
+    def testCRMDataNotShared(self):
+        first = CommandReturnMessage(ctr=1, return_code=ReturnCodes.ACKNOWLEDGE)
+        second = CommandReturnMessage(ctr=2, return_code=ReturnCodes.ACCESS_DENIED)
+        self.assertEqual(first.ctr, 1)
+        self.assertEqual(first.return_code, ReturnCodes.ACKNOWLEDGE)
+        self.assertEqual(second.ctr, 2)
+
+    def testUnknownReturnCode(self):
+        crm = CommandReturnMessage(ctr=1, return_code=ReturnCodes.ACKNOWLEDGE)
+        crm.data[1] = 0xAA
+        with self.assertRaises(ValueError):
+            crm.return_code
+
+    def testDTODataCopied(self):
+        data = bytearray(8)
+        daq = DataAcquisitionMessage(odt_number=3, data=data)
+        self.assertEqual(daq.odt_number, 3)
+        self.assertEqual(data[0], 0)
+
+    def testFromCANMessage(self):
+        msg = can.Message(
+            arbitration_id=0x321, data=[0xFF, 0, 0x27], timestamp=1.5, channel="test"
+        )
+        crm = CommandReturnMessage.from_can_message(msg)
+        msg.data[2] = 0
+        self.assertIsInstance(crm, CommandReturnMessage)
+        self.assertEqual(crm.ctr, 0x27)
+        self.assertEqual(crm.return_code, ReturnCodes.ACKNOWLEDGE)
+        self.assertEqual((crm.timestamp, crm.channel, crm.dlc), (1.5, "test", 3))
+
+    def testDTODataTooLong(self):
+        self.assertRaises(
+            ValueError, DataAcquisitionMessage, odt_number=0, data=bytearray(9)
+        )
+
+    def testDAQDecodeRegisteredODT(self):
+        odt = ObjectDescriptorTable(
+            elements=[Element(name="g", size=2, address=6)], number=0x42
+        )
+        daq = DataAcquisitionMessage(odt_number=0x42, data=bytearray(range(0x42, 0x4A)))
+        self.assertRaises(KeyError, daq.decode)
+        odt.register()
+
+        try:
+            self.assertEqual(daq.decode(), {"g": 0x4344})
+        finally:
+            odt.deregister()
+
+        self.assertRaises(KeyError, daq.decode)
+
+    def testODTRegisterDuplicate(self):
+        first, second = (
+            ObjectDescriptorTable(
+                elements=[Element(name=name, size=1, address=0)], number=0x43
+            )
+            for name in ("h", "i")
+        )
+        daq = DataAcquisitionMessage(odt_number=0x43, data=bytearray(range(0x43, 0x4B)))
+        first.register()
+        second.register()
+        second.deregister()
+
+        try:
+            self.assertEqual(daq.decode(), {"h": 0x44})
+        finally:
+            first.deregister()
+
+        self.assertRaises(KeyError, daq.decode)
+
+    def testODTRegisterInvalidNumber(self):
+        odt = ObjectDescriptorTable(
+            elements=[Element(name="j", size=1, address=0)], number=0xFE
+        )
+        self.assertRaises(ValueError, odt.register)
+        self.assertRaises(KeyError, DAQ_DB.get_message_by_name, "254")
+
+
+if __name__ == "__main__":
+    unittest.main()  # pragma: no cover